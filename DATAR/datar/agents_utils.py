@@ -30,6 +30,9 @@ warnings.filterwarnings(
 OPENROUTER_API_KEY_ENV = "OPENROUTER_API_KEY"
 OPENROUTER_API_BASE_DEFAULT = "https://openrouter.ai/api/v1"
 
+# Indica si ya se buscó y cargó el .env en este proceso
+_env_cargado = False
+
 
 @dataclass
 class OpenRouterConfig:
@@ -45,13 +48,18 @@ def load_env_if_needed() -> None:
     """
     Carga variables de entorno desde un archivo .env si existe.
 
-    Esta función es segura de llamar múltiples veces; load_dotenv
-    solo complementa lo que ya está en el entorno sin sobrescribir
-    valores existentes por defecto.
+    El archivo se busca y se lee solo en la primera llamada del proceso; las
+    siguientes no hacen nada, aunque en la primera no se haya encontrado ningún
+    .env (uno creado después no se carga hasta reiniciar). load_dotenv solo
+    complementa lo que ya está en el entorno, sin sobrescribir valores existentes.
     
     Siempre busca el archivo .env en la raíz del proyecto DATAR
     (donde está el directorio 'datar').
     """
+    global _env_cargado
+    if _env_cargado:
+        return
+
     # Busca el .env en la raíz del proyecto DATAR
     # Navega desde datar/agents_utils.py hacia arriba hasta encontrar DATAR/
     current_file = Path(__file__).resolve()
@@ -66,6 +74,8 @@ def load_env_if_needed() -> None:
         if parent_env.exists():
             load_dotenv(dotenv_path=parent_env, override=False)
 
+    _env_cargado = True
+
 
 def get_openrouter_config(
     *,
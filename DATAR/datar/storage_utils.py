@@ -6,6 +6,14 @@ Diseño:
 - Opcionalmente se puede definir `MEDIA_PUBLIC_BASE_URL` para personalizar la URL base
   pública (por ejemplo, detrás de un CDN). Si no se define, se usa:
   https://storage.googleapis.com/<bucket>/<ruta_objeto>
+- Los objetos se suben con cabecera `Cache-Control` (por defecto
+  `private, max-age=86400`, configurable con `MEDIA_CACHE_CONTROL`). Los agentes
+  nombran cada objeto con marca de tiempo y un sufijo `uuid4`, de modo que dos
+  generaciones en el mismo segundo no escriben sobre el mismo objeto y el navegador
+  puede reutilizarlos sin volver a descargarlos. Es `private` porque son medios
+  generados por usuarios y el acceso al bucket se controla por IAM: las cachés
+  compartidas no deben guardarlos. Solo si el bucket es público conviene usar
+  `public, max-age=86400` para que también los sirva un CDN.
 
 Estas funciones están pensadas para usarse desde los agentes `Gente_*` que generan
 archivos `.wav` y `.png` (Pasto, Sonora, Intuitiva, Bosque). En caso de cualquier
@@ -14,12 +22,37 @@ menos la ruta local del archivo para no romper la experiencia.
 """
 
 import os
+import threading
 from typing import Optional
 
 from google.cloud import storage
 
 MEDIA_BUCKET_ENV = "MEDIA_BUCKET_NAME"
 MEDIA_BASE_URL_ENV = "MEDIA_PUBLIC_BASE_URL"
+MEDIA_CACHE_CONTROL_ENV = "MEDIA_CACHE_CONTROL"
+MEDIA_CACHE_CONTROL_DEFAULT = "private, max-age=86400"
+
+_client: Optional[storage.Client] = None
+_client_lock = threading.Lock()
+
+
+def _get_client() -> storage.Client:
+    """
+    Devuelve un cliente de Cloud Storage compartido por todas las subidas.
+
+    Crear un `storage.Client` en cada llamada abre una sesión HTTP nueva (con su
+    handshake TLS); reutilizarlo mantiene vivas las conexiones hacia Storage.
+
+    Las subidas pueden llegar a la vez desde varios hilos (herramientas que se
+    ejecutan con `asyncio.to_thread`), así que la creación se protege con un lock
+    para que solo el primero construya el cliente y los demás lo reutilicen.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = storage.Client()
+    return _client
 
 
 def _get_bucket_name() -> str:
@@ -32,6 +65,11 @@ def _get_bucket_name() -> str:
     return bucket_name
 
 
+def _get_cache_control() -> str:
+    """Devuelve la cabecera Cache-Control con la que se suben los medios."""
+    return os.getenv(MEDIA_CACHE_CONTROL_ENV) or MEDIA_CACHE_CONTROL_DEFAULT
+
+
 def _get_public_base_url(bucket_name: Optional[str] = None) -> str:
     """
     Devuelve la URL base pública para los objetos del bucket.
@@ -64,12 +102,13 @@ def upload_file_to_gcs(
     """
     bucket_name = _get_bucket_name()
 
-    client = storage.Client()
+    client = _get_client()
     bucket = client.bucket(bucket_name)
     blob = bucket.blob(destination_path)
 
     if content_type:
         blob.content_type = content_type
+    blob.cache_control = _get_cache_control()
 
     blob.upload_from_filename(local_path)
 
@@ -90,12 +129,13 @@ def upload_bytes_to_gcs(
     """
     bucket_name = _get_bucket_name()
 
-    client = storage.Client()
+    client = _get_client()
     bucket = client.bucket(bucket_name)
     blob = bucket.blob(destination_path)
 
     if content_type:
         blob.content_type = content_type
+    blob.cache_control = _get_cache_control()
 
     blob.upload_from_string(data)
 
@@ -4,8 +4,8 @@ from mcp.server.fastmcp import FastMCP
 import requests
 from bs4 import BeautifulSoup
 import fitz  # PyMuPDF
+import logging
 import os
-from datetime import datetime
 try:
     import google.generativeai as genai
 except Exception:  # ImportError or module not available in this env
@@ -14,6 +14,13 @@ except Exception:  # ImportError or module not available in this env
 # Inicializa el servidor
 mcp = FastMCP("servidor_bosque")
 
+# Los registros van por logging (stderr) y no por stdout, que es el canal del
+# protocolo MCP cuando el servidor corre sobre stdio
+logger = logging.getLogger(__name__)
+
+# Sesión HTTP compartida para reutilizar conexiones hacia las fuentes web
+_http = requests.Session()
+
 if genai is not None:
     try:
         genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
@@ -39,14 +46,13 @@ FUENTES = {
 
 def log_uso(fuente, tipo):
     """Guarda registro de cada fuente usada."""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    print(f"[{timestamp}] Usando {tipo}: {fuente}", flush=True)
+    logger.info("Usando %s: %s", tipo, fuente)
 
 @mcp.tool()
 def leer_pagina(url: str) -> str:
     """Lee y devuelve texto de una página web."""
     log_uso(url, "página web")
-    resp = requests.get(url)
+    resp = _http.get(url)
     soup = BeautifulSoup(resp.text, "html.parser")
     text = soup.get_text(separator="\n", strip=True)
     return text[:4000]
@@ -59,22 +65,30 @@ def explorar_pdf(tema: str) -> str:
     concepto de individuo y asociaciones.Usa el modelo Gemini para formularlas.
     """
     tema = tema.lower().strip()
-    if tema not in PDFS:
+    ruta_pdf = PDFS.get(tema)
+    if ruta_pdf is None:
         return f"No hay un PDF registrado para el tema '{tema}'."
 
-    ruta_pdf = PDFS[tema]
     if not os.path.exists(ruta_pdf):
         return f"No se encontró el archivo: {ruta_pdf}"
 
     log_uso(ruta_pdf, "PDF")
 
-    # Extraer texto del PDF
-    texto = ""
+    # Extraer texto del PDF. Las páginas se acumulan en una lista y se unen al
+    # final; como solo se usan los primeros 6000 caracteres, se deja de leer
+    # el documento en cuanto se alcanzan.
+    limite_texto = 6000  # limitar el texto para el modelo
+    paginas = []
+    total = 0
     with fitz.open(ruta_pdf) as doc:
         for pagina in doc:
-            texto += pagina.get_text()
+            contenido = pagina.get_text()
+            paginas.append(contenido)
+            total += len(contenido)
+            if total >= limite_texto:
+                break
 
-    texto_corto = texto[:6000]  # limitar el texto para el modelo
+    texto_corto = "".join(paginas)[:limite_texto]
 
     # Crear prompt reflexivo
     prompt = f"""
@@ -112,22 +126,23 @@ def explorar(tema: str) -> str:
     Busca información sobre un tema combinando PDFs y fuentes web.
     """
     tema = tema.lower().strip()
-    respuesta = ""
+    partes = []
 
     # Intentar con PDF
     if tema in PDFS:
-        respuesta += explorar_pdf(tema) + "\n\n"
+        partes.append(explorar_pdf(tema) + "\n\n")
 
     # Buscar fuente web
     for clave, link in FUENTES.items():
         if clave in tema:
             log_uso(link, "fuente web")
-            resp = requests.get(link)
+            resp = _http.get(link)
             soup = BeautifulSoup(resp.text, "html.parser")
             text = soup.get_text(separator="\n", strip=True)
             resumen = text[:1500]
-            respuesta += f"🌐 Fuente web: {link}\n\n{resumen}\n\n"
+            partes.append(f"🌐 Fuente web: {link}\n\n{resumen}\n\n")
 
+    respuesta = "".join(partes)
     if not respuesta.strip():
         respuesta = f"No encontré información registrada para el tema '{tema}'."
 
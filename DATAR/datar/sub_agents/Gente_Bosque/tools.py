@@ -1,49 +1,64 @@
 # tools.py - Herramientas para el Agente Bosque
 
+import asyncio
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+import charset_normalizer
 import requests
 from bs4 import BeautifulSoup
-from datetime import datetime
 
-def log_uso(fuente, tipo):
-    """Guarda registro de cada fuente usada."""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    print(f"[{timestamp}] Usando {tipo}: {fuente}", flush=True)
-
-def leer_pagina(url: str) -> str:
-    """
-    Lee y devuelve texto de una página web.
-
-    Args:
-        url: URL de la página web a leer
-
-    Returns:
-        Texto extraído de la página (hasta 4000 caracteres)
-    """
-    log_uso(url, "página web")
-    try:
-        resp = requests.get(url, timeout=10)
-        soup = BeautifulSoup(resp.text, "html.parser")
-        text = soup.get_text(separator="\n", strip=True)
-        return text[:4000]
-    except Exception as e:
-        return f"Error al leer la página: {str(e)}"
+logger = logging.getLogger(__name__)
 
-def explorar_pdf(tema: str) -> str:
-    """
-    Explora temas relacionados con filosofía de la biología, simbiosis,
-    concepto de individuo y asociaciones.
+# Caché del texto de las páginas leídas. Es una LRU acotada con expiración (TTL):
+# evita descargar las mismas fuentes en cada llamada sin crecer indefinidamente.
+PAGINAS_CACHE_MAX = 32
+PAGINAS_CACHE_TTL_SEG = 60 * 60
+_paginas_cache: "OrderedDict[str, tuple[float, str]]" = OrderedDict()
+_paginas_cache_lock = threading.Lock()
 
-    Args:
-        tema: Tema a explorar (filosofia_fungi, margullis, hongo_planta, donna)
+# Sesión HTTP compartida: reutiliza las conexiones (keep-alive) hacia las fuentes
+# en lugar de abrir una conexión TCP/TLS nueva en cada lectura.
+_http = requests.Session()
 
-    Returns:
-        Información filosófica sobre el tema
-    """
-    tema = tema.lower().strip()
+# Máximo de bytes que se leen de una página. Solo se devuelven 4000 caracteres
+# de texto, así que no hace falta cargar en memoria páginas completas muy grandes.
+PAGINA_MAX_BYTES = 2 * 1024 * 1024
 
-    # Respuestas predefinidas sobre temas filosóficos
-    respuestas = {
-        "filosofia_fungi": """
+def log_uso(fuente, tipo):
+    """Guarda registro de cada fuente usada."""
+    logger.info("Usando %s: %s", tipo, fuente)
+
+def _leer_pagina_cache(url: str):
+    """Devuelve el texto cacheado de `url`, o None si no existe o ya expiró."""
+    with _paginas_cache_lock:
+        entrada = _paginas_cache.get(url)
+        if entrada is None:
+            return None
+        guardado_en, texto = entrada
+        if time.monotonic() - guardado_en > PAGINAS_CACHE_TTL_SEG:
+            del _paginas_cache[url]
+            return None
+        _paginas_cache.move_to_end(url)
+        return texto
+
+def _guardar_pagina_cache(url: str, texto: str) -> None:
+    """Guarda el texto de `url` y descarta las entradas menos usadas si se supera el límite."""
+    with _paginas_cache_lock:
+        _paginas_cache[url] = (time.monotonic(), texto)
+        _paginas_cache.move_to_end(url)
+        while len(_paginas_cache) > PAGINAS_CACHE_MAX:
+            _paginas_cache.popitem(last=False)
+
+# Tablas estáticas de las herramientas: se construyen una sola vez al importar
+# el módulo en lugar de reconstruirse en cada llamada.
+
+# Respuestas predefinidas sobre temas filosóficos
+RESPUESTAS_PDF = {
+    "filosofia_fungi": """
 📄 Tema: Filosofía de los hongos
 
 Resumen: Los hongos desafían nuestra noción tradicional de individualidad.
@@ -56,7 +71,7 @@ Preguntas reflexivas:
 - ¿Qué significa ser un "individuo" si tu supervivencia depende completamente de otros organismos?
 - ¿Podemos aplicar conceptos de cooperación fúngica a nuestras propias sociedades humanas?
         """,
-        "margullis": """
+    "margullis": """
 📄 Tema: Teoría de la endosimbiosis de Lynn Margulis
 
 Resumen: Margulis propuso que las células eucariotas se originaron por simbiosis entre
@@ -69,7 +84,7 @@ Preguntas reflexivas:
 - ¿Qué papel juega la cooperación en la evolución de la vida compleja?
 - ¿Cómo cambia nuestra relación con la naturaleza si reconocemos que llevamos otros organismos dentro de nosotros?
         """,
-        "hongo_planta": """
+    "hongo_planta": """
 📄 Tema: Simbiosis entre hongos y plantas
 
 Resumen: Las micorrizas son asociaciones simbióticas entre hongos y raíces de plantas.
@@ -82,7 +97,7 @@ Preguntas reflexivas:
 - ¿Pueden existir identidades separadas cuando dos organismos son completamente interdependientes?
 - ¿Qué nos enseña la micorriza sobre las relaciones humanas y la interdependencia?
         """,
-        "donna": """
+    "donna": """
 📄 Tema: Pensamiento multiespecie (Donna Haraway)
 
 Resumen: Haraway propone que debemos pensar más allá del antropocentrismo y
@@ -94,12 +109,258 @@ Preguntas reflexivas:
 - ¿Qué responsabilidades tenemos hacia otros seres con los que compartimos el planeta?
 - ¿Puede el concepto de "individuo humano" sostenerse cuando dependemos de billones de microbios?
         """
+}
+
+TEMAS_PDF_DISPONIBLES = ", ".join(RESPUESTAS_PDF)
+
+# Fuentes web predefinidas para `explorar`
+FUENTES = {
+    "pot": "https://bogota.gov.co/bog/pot-2022-2035/",
+    "biomimética": "https://asknature.org/",
+    "suelo": "https://www.frontiersin.org/journals/microbiology/articles/10.3389/fmicb.2019.02872/full",
+    "briofitas": "https://stri.si.edu/es/noticia/briofitas",
+}
+
+FUENTES_DISPONIBLES = ", ".join(FUENTES)
+
+# Coordenadas fijas del Bosque de La Macarena (lat, lon)
+COORDENADAS_MACARENA = (4.614773, -74.063173)
+
+# Estilos emocionales para mapas (colores y paletas)
+ESTILOS_EMOCIONALES = {
+    "serenidad": {
+        "perimeter": {"fill": False, "lw": 0, "zorder": 0},
+        "streets": {
+            "fc": "#CDE8E5",
+            "ec": "#2C6E49",
+            "lw": 1.5,
+            "zorder": 3
+        },
+        "building": {
+            "palette": ["#A7C7E7", "#CDE8E5", "#2C6E49"],
+            "ec": "#2C6E49",
+            "lw": 0.5,
+            "zorder": 4
+        },
+        "background": "#CDE8E5"
+    },
+    "asombro": {
+        "perimeter": {"fill": False, "lw": 0, "zorder": 0},
+        "streets": {
+            "fc": "#FFF1C1",
+            "ec": "#8713D4",
+            "lw": 2,
+            "zorder": 3
+        },
+        "building": {
+            "palette": ["#73D2DE", "#FFF1C1", "#8713D4"],
+            "ec": "#8713D4",
+            "lw": 0.8,
+            "zorder": 4
+        },
+        "background": "#FFF1C1"
+    },
+    "curiosidad": {
+        "perimeter": {"fill": False, "lw": 0, "zorder": 0},
+        "streets": {
+            "fc": "#FAF3DD",
+            "ec": "#0B6E4F",
+            "lw": 1.5,
+            "zorder": 3
+        },
+        "building": {
+            "palette": ["#3ABEFF", "#FAF3DD", "#0B6E4F"],
+            "ec": "#0B6E4F",
+            "lw": 0.6,
+            "zorder": 4
+        },
+        "background": "#FAF3DD"
+    },
+    "contemplacion": {
+        "perimeter": {"fill": False, "lw": 0, "zorder": 0},
+        "streets": {
+            "fc": "#E0CFCB",
+            "ec": "#BB9DD6",
+            "lw": 1.2,
+            "zorder": 3
+        },
+        "building": {
+            "palette": ["#A7A6BA", "#E0CFCB", "#BB9DD6"],
+            "ec": "#BB9DD6",
+            "lw": 0.5,
+            "zorder": 4
+        },
+        "background": "#E0CFCB"
+    },
+    "melancolia": {
+        "perimeter": {"fill": False, "lw": 0, "zorder": 0},
+        "streets": {
+            "fc": "#C3B1E1",
+            "ec": "#3A3D5C",
+            "lw": 1.5,
+            "zorder": 3
+        },
+        "building": {
+            "palette": ["#6C91BF", "#C3B1E1", "#3A3D5C"],
+            "ec": "#3A3D5C",
+            "lw": 0.7,
+            "zorder": 4
+        },
+        "background": "#C3B1E1"
+    },
+    "vitalidad": {
+        "perimeter": {"fill": False, "lw": 0, "zorder": 0},
+        "streets": {
+            "fc": "#FFE066",
+            "ec": "#148D04",
+            "lw": 2,
+            "zorder": 3
+        },
+        "building": {
+            "palette": ["#0077B6", "#FFE066", "#148D04"],
+            "ec": "#148D04",
+            "lw": 0.8,
+            "zorder": 4
+        },
+        "background": "#FFE066"
+    },
+    "frescura": {
+        "perimeter": {"fill": False, "lw": 0, "zorder": 0},
+        "streets": {
+            "fc": "#C0FDFB",
+            "ec": "#00A896",
+            "lw": 1.5,
+            "zorder": 3
+        },
+        "building": {
+            "palette": ["#028090", "#C0FDFB", "#00A896"],
+            "ec": "#00A896",
+            "lw": 0.6,
+            "zorder": 4
+        },
+        "background": "#C0FDFB"
+    },
+    "alegria": {
+        "perimeter": {"fill": False, "lw": 0, "zorder": 0},
+        "streets": {
+            "fc": "#FFF5B7",
+            "ec": "#FF7B00",
+            "lw": 2,
+            "zorder": 3
+        },
+        "building": {
+            "palette": ["#F8DF00", "#FFF5B7", "#FF7B00"],
+            "ec": "#FF7B00",
+            "lw": 0.8,
+            "zorder": 4
+        },
+        "background": "#FFF5B7"
     }
+}
+
+# Palabras clave asociadas a emociones
+CLAVES_EMOCIONES = {
+    # Serenidad
+    "tranquilidad": "serenidad", "calma": "serenidad", "paz": "serenidad", "silencio": "serenidad",
+    # Curiosidad
+    "curiosidad": "curiosidad", "exploracion": "curiosidad", "descubrir": "curiosidad", "pregunta": "curiosidad",
+    # Contemplacion
+    "reflexion": "contemplacion", "observar": "contemplacion", "pensamiento": "contemplacion", "introspeccion": "contemplacion",
+    # Melancolia
+    "nostalgia": "melancolia", "tristeza": "melancolia", "melancolia": "melancolia", "recuerdo": "melancolia",
+    # Vitalidad
+    "energia": "vitalidad", "vida": "vitalidad", "entusiasmo": "vitalidad", "movimiento": "vitalidad",
+    # Frescura
+    "humedad": "frescura", "rocío": "frescura", "niebla": "frescura", "lluvia": "frescura", "bruma": "frescura",
+    # Asombro
+    "sorpresa": "asombro", "wow": "asombro", "maravilla": "asombro", "impactante": "asombro",
+    # Alegría
+    "felicidad": "alegria", "gozo": "alegria", "jubilo": "alegria", "contento": "alegria"
+}
+
+def _descargar_texto_pagina(url: str) -> tuple[bool, str]:
+    """
+    Descarga `url` y extrae su texto (hasta 4000 caracteres).
+
+    Es bloqueante (red + parseo HTML); las herramientas async la ejecutan en un hilo.
+    El cuerpo se lee por bloques y se corta en PAGINA_MAX_BYTES, de modo que la
+    memoria usada no depende del tamaño de la página. Si se corta antes del final,
+    la conexión se cierra con datos sin leer y no vuelve al pool de `_http`; para
+    páginas de más de PAGINA_MAX_BYTES se acepta esa conexión perdida.
+
+    Returns:
+        Tupla (exitoso, texto) donde exitoso indica si la respuesta HTTP fue correcta.
+    """
+    bloques = []
+    leidos = 0
+    with _http.get(url, timeout=10, stream=True) as resp:
+        for bloque in resp.iter_content(chunk_size=64 * 1024):
+            bloques.append(bloque)
+            leidos += len(bloque)
+            if leidos >= PAGINA_MAX_BYTES:
+                break
+        exitoso = resp.ok
+        codificacion = resp.encoding
+
+    # Decodificar como lo hacía `resp.text`: charset de la cabecera Content-Type o,
+    # si no hay, el detectado en el cuerpo con charset_normalizer (el detector que
+    # usa requests). `errors="replace"` evita que un carácter multibyte partido por
+    # el corte en PAGINA_MAX_BYTES arruine toda la página.
+    cuerpo = b"".join(bloques)
+    if codificacion is None:
+        codificacion = charset_normalizer.detect(cuerpo)["encoding"]
+    try:
+        html = cuerpo.decode(codificacion or "utf-8", errors="replace")
+    except LookupError:
+        html = cuerpo.decode("utf-8", errors="replace")
+
+    soup = BeautifulSoup(html, "html.parser")
+    text = soup.get_text(separator="\n", strip=True)[:4000]
+    return exitoso, text
+
+async def leer_pagina(url: str) -> str:
+    """
+    Lee y devuelve texto de una página web.
+
+    Args:
+        url: URL de la página web a leer
+
+    Returns:
+        Texto extraído de la página (hasta 4000 caracteres)
+    """
+    log_uso(url, "página web")
+    cacheado = _leer_pagina_cache(url)
+    if cacheado is not None:
+        return cacheado
+    try:
+        # La descarga se hace en un hilo para no bloquear el event loop del
+        # servidor ADK mientras se espera a la fuente web.
+        exitoso, text = await asyncio.to_thread(_descargar_texto_pagina, url)
+        # Solo se cachean respuestas exitosas para no fijar errores temporales
+        if exitoso:
+            _guardar_pagina_cache(url, text)
+        return text
+    except Exception as e:
+        return f"Error al leer la página: {str(e)}"
+
+def explorar_pdf(tema: str) -> str:
+    """
+    Explora temas relacionados con filosofía de la biología, simbiosis,
+    concepto de individuo y asociaciones.
+
+    Args:
+        tema: Tema a explorar (filosofia_fungi, margullis, hongo_planta, donna)
+
+    Returns:
+        Información filosófica sobre el tema
+    """
+    tema = tema.lower().strip()
 
-    if tema in respuestas:
-        return respuestas[tema]
+    respuesta = RESPUESTAS_PDF.get(tema)
+    if respuesta is not None:
+        return respuesta
     else:
-        return f"No se encontró información específica sobre '{tema}'. Temas disponibles: {', '.join(respuestas.keys())}"
+        return f"No se encontró información específica sobre '{tema}'. Temas disponibles: {TEMAS_PDF_DISPONIBLES}"
 
 def inferir_especies(descripcion: str) -> str:
     """
@@ -179,16 +440,20 @@ def inferir_especies(descripcion: str) -> str:
     ])
 
     if especies_sugeridas:
-        salida = "🌿 Basándome en tu descripción, estas especies podrían estar presentes:\n\n"
-        for i, especie in enumerate(especies_sugeridas[:8], 1):
-            salida += f"{i}. {especie}\n"
-        salida += "\n💡 Estas son solo algunas posibilidades basadas en las condiciones que describiste."
+        lineas = "".join(
+            f"{i}. {especie}\n" for i, especie in enumerate(especies_sugeridas[:8], 1)
+        )
+        salida = (
+            "🌿 Basándome en tu descripción, estas especies podrían estar presentes:\n\n"
+            f"{lineas}"
+            "\n💡 Estas son solo algunas posibilidades basadas en las condiciones que describiste."
+        )
     else:
         salida = "No pude inferir condiciones claras a partir de tu descripción."
 
     return salida
 
-def explorar(termino: str) -> str:
+async def explorar(termino: str) -> str:
     """
     Busca información sobre un término en fuentes predefinidas.
 
@@ -198,36 +463,17 @@ def explorar(termino: str) -> str:
     Returns:
         Información encontrada
     """
-    fuentes = {
-        "pot": "https://bogota.gov.co/bog/pot-2022-2035/",
-        "biomimética": "https://asknature.org/",
-        "suelo": "https://www.frontiersin.org/journals/microbiology/articles/10.3389/fmicb.2019.02872/full",
-        "briofitas": "https://stri.si.edu/es/noticia/briofitas",
-    }
-
     termino_lower = termino.lower().strip()
 
-    if termino_lower in fuentes:
-        return leer_pagina(fuentes[termino_lower])
+    url = FUENTES.get(termino_lower)
+    if url is not None:
+        return await leer_pagina(url)
     else:
-        return f"Término '{termino}' no encontrado. Fuentes disponibles: {', '.join(fuentes.keys())}"
+        return f"Término '{termino}' no encontrado. Fuentes disponibles: {FUENTES_DISPONIBLES}"
 
-def crear_mapa_emocional(descripcion: str) -> str:
+def _crear_mapa_emocional_bloqueante(descripcion: str) -> str:
     """
-    Genera un mapa emocional del Bosque La Macarena (Bogotá) usando osmnx + geopandas + matplotlib.
-    A partir de una descripción textual, detecta una emoción o sensación asociada y aplica una 
-    paleta de colores contrastante para representar visualmente ese estado emocional.
-
-    Emociones o sensaciones principales:
-    
-    - serenidad: calma, paz, tranquilidad, silencio reconfortante, conexión armónica con el entorno
-    - curiosidad: exploración activa, preguntas, investigar, intriga, deseo de descubrir
-    - contemplacion: reflexión profunda, observación sin prisa, introspección, pensamiento pausado
-    - melancolia: nostalgia, tristeza reflexiva, melancolía, pérdida, belleza dolorosa, memoria
-    - vitalidad: energía, vida abundante, movimiento, biodiversidad visible, entusiasmo
-    - frescura: humedad, rocío, bruma, niebla, lluvia, tierra mojada, ambiente húmedo
-    - asombro: sorpresa intensa, "wow", descubrimiento impactante, maravilla, lo inesperado
-    - alegria: felicidad pura, celebración, gozo, contento, bienestar emocional
+    Descarga los datos de OpenStreetMap, dibuja el mapa y lo sube a Cloud Storage (bloqueante).
     """
     import os
     import gc
@@ -251,165 +497,10 @@ def crear_mapa_emocional(descripcion: str) -> str:
     ox.settings.use_cache = True  # Usar cache para mejorar rendimiento
     ox.settings.log_console = False  # Reducir logs
 
-    # Coordenadas fijas del Bosque de La Macarena (lat, lon)
-    coordenadas = (4.614773, -74.063173)
-
-    # Estilos emocionales para mapas (colores y paletas)
-    estilos_emocionales = {
-        "serenidad": {
-            "perimeter": {"fill": False, "lw": 0, "zorder": 0},
-            "streets": {
-                "fc": "#CDE8E5",
-                "ec": "#2C6E49",
-                "lw": 1.5,
-                "zorder": 3
-            },
-            "building": {
-                "palette": ["#A7C7E7", "#CDE8E5", "#2C6E49"],
-                "ec": "#2C6E49",
-                "lw": 0.5,
-                "zorder": 4
-            },
-            "background": "#CDE8E5"
-        },
-        "asombro": {
-            "perimeter": {"fill": False, "lw": 0, "zorder": 0},
-            "streets": {
-                "fc": "#FFF1C1",
-                "ec": "#8713D4",
-                "lw": 2,
-                "zorder": 3
-            },
-            "building": {
-                "palette": ["#73D2DE", "#FFF1C1", "#8713D4"],
-                "ec": "#8713D4",
-                "lw": 0.8,
-                "zorder": 4
-            },
-            "background": "#FFF1C1"
-        },
-        "curiosidad": {
-            "perimeter": {"fill": False, "lw": 0, "zorder": 0},
-            "streets": {
-                "fc": "#FAF3DD",
-                "ec": "#0B6E4F",
-                "lw": 1.5,
-                "zorder": 3
-            },
-            "building": {
-                "palette": ["#3ABEFF", "#FAF3DD", "#0B6E4F"],
-                "ec": "#0B6E4F",
-                "lw": 0.6,
-                "zorder": 4
-            },
-            "background": "#FAF3DD"
-        },
-        "contemplacion": {
-            "perimeter": {"fill": False, "lw": 0, "zorder": 0},
-            "streets": {
-                "fc": "#E0CFCB",
-                "ec": "#BB9DD6",
-                "lw": 1.2,
-                "zorder": 3
-            },
-            "building": {
-                "palette": ["#A7A6BA", "#E0CFCB", "#BB9DD6"],
-                "ec": "#BB9DD6",
-                "lw": 0.5,
-                "zorder": 4
-            },
-            "background": "#E0CFCB"
-        },
-        "melancolia": {
-            "perimeter": {"fill": False, "lw": 0, "zorder": 0},
-            "streets": {
-                "fc": "#C3B1E1",
-                "ec": "#3A3D5C",
-                "lw": 1.5,
-                "zorder": 3
-            },
-            "building": {
-                "palette": ["#6C91BF", "#C3B1E1", "#3A3D5C"],
-                "ec": "#3A3D5C",
-                "lw": 0.7,
-                "zorder": 4
-            },
-            "background": "#C3B1E1"
-        },
-        "vitalidad": {
-            "perimeter": {"fill": False, "lw": 0, "zorder": 0},
-            "streets": {
-                "fc": "#FFE066",
-                "ec": "#148D04",
-                "lw": 2,
-                "zorder": 3
-            },
-            "building": {
-                "palette": ["#0077B6", "#FFE066", "#148D04"],
-                "ec": "#148D04",
-                "lw": 0.8,
-                "zorder": 4
-            },
-            "background": "#FFE066"
-        },
-        "frescura": {
-            "perimeter": {"fill": False, "lw": 0, "zorder": 0},
-            "streets": {
-                "fc": "#C0FDFB",
-                "ec": "#00A896",
-                "lw": 1.5,
-                "zorder": 3
-            },
-            "building": {
-                "palette": ["#028090", "#C0FDFB", "#00A896"],
-                "ec": "#00A896",
-                "lw": 0.6,
-                "zorder": 4
-            },
-            "background": "#C0FDFB"
-        },
-        "alegria": {
-            "perimeter": {"fill": False, "lw": 0, "zorder": 0},
-            "streets": {
-                "fc": "#FFF5B7",
-                "ec": "#FF7B00",
-                "lw": 2,
-                "zorder": 3
-            },
-            "building": {
-                "palette": ["#F8DF00", "#FFF5B7", "#FF7B00"],
-                "ec": "#FF7B00",
-                "lw": 0.8,
-                "zorder": 4
-            },
-            "background": "#FFF5B7"
-        }
-    }
-
-    # Palabras clave asociadas a emociones
-    claves = {
-        # Serenidad
-        "tranquilidad": "serenidad", "calma": "serenidad", "paz": "serenidad", "silencio": "serenidad",
-        # Curiosidad
-        "curiosidad": "curiosidad", "exploracion": "curiosidad", "descubrir": "curiosidad", "pregunta": "curiosidad",
-        # Contemplacion
-        "reflexion": "contemplacion", "observar": "contemplacion", "pensamiento": "contemplacion", "introspeccion": "contemplacion",
-        # Melancolia
-        "nostalgia": "melancolia", "tristeza": "melancolia", "melancolia": "melancolia", "recuerdo": "melancolia",
-        # Vitalidad
-        "energia": "vitalidad", "vida": "vitalidad", "entusiasmo": "vitalidad", "movimiento": "vitalidad",
-        # Frescura
-        "humedad": "frescura", "rocío": "frescura", "niebla": "frescura", "lluvia": "frescura", "bruma": "frescura",
-        # Asombro
-        "sorpresa": "asombro", "wow": "asombro", "maravilla": "asombro", "impactante": "asombro",
-        # Alegría
-        "felicidad": "alegria", "gozo": "alegria", "jubilo": "alegria", "contento": "alegria"
-    }
-
     descripcion_lower = descripcion.lower()
 
     emocion_detectada = next(
-        (emo for palabra, emo in claves.items() if palabra in descripcion_lower),
+        (emo for palabra, emo in CLAVES_EMOCIONES.items() if palabra in descripcion_lower),
         None
     )
 
@@ -420,7 +511,7 @@ def crear_mapa_emocional(descripcion: str) -> str:
             "Incluya palabras como: calma, curiosidad, nostalgia, energía, lluvia, sorpresa, felicidad, etc."
         )
 
-    estilo_completo = estilos_emocionales[emocion_detectada]
+    estilo_completo = ESTILOS_EMOCIONALES[emocion_detectada]
     color_fondo = estilo_completo["background"]
     estilo_calles = estilo_completo["streets"]
     estilo_edificios = estilo_completo["building"]
@@ -431,7 +522,7 @@ def crear_mapa_emocional(descripcion: str) -> str:
         
         # Obtener red de calles usando osmnx
         G = ox.graph_from_point(
-            coordenadas,
+            COORDENADAS_MACARENA,
             dist=distancia,
             network_type='all',
             simplify=True
@@ -449,7 +540,7 @@ def crear_mapa_emocional(descripcion: str) -> str:
         # Obtener edificios
         tags = {'building': True}
         gdf_edificios = ox.features_from_point(
-            coordenadas,
+            COORDENADAS_MACARENA,
             dist=distancia,
             tags=tags
         )
@@ -529,8 +620,8 @@ def crear_mapa_emocional(descripcion: str) -> str:
         else:
             # Fallback: usar buffer alrededor del punto central
             buffer_deg = distancia / 111000  # Conversión aproximada de metros a grados
-            ax.set_xlim(coordenadas[1] - buffer_deg, coordenadas[1] + buffer_deg)
-            ax.set_ylim(coordenadas[0] - buffer_deg, coordenadas[0] + buffer_deg)
+            ax.set_xlim(COORDENADAS_MACARENA[1] - buffer_deg, COORDENADAS_MACARENA[1] + buffer_deg)
+            ax.set_ylim(COORDENADAS_MACARENA[0] - buffer_deg, COORDENADAS_MACARENA[0] + buffer_deg)
         
         ax.set_aspect('equal')
         ax.axis('off')
@@ -545,7 +636,7 @@ def crear_mapa_emocional(descripcion: str) -> str:
         )
 
         # Generar nombre de archivo
-        filename = f"mapa_emocional_{emocion_detectada}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.png"
+        filename = f"mapa_emocional_{emocion_detectada}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex}.png"
         
         # Usar archivo temporal que se eliminará después de subir
         import tempfile
@@ -563,9 +654,9 @@ def crear_mapa_emocional(descripcion: str) -> str:
                     facecolor=color_fondo
                 )
             
-            # Cerrar la figura para liberar memoria
+            # Cerrar la figura para liberar memoria. Solo la propia: con varios mapas
+            # renderizándose en hilos, plt.close('all') cerraría las figuras de otros.
             plt.close(fig)
-            plt.close('all')  # Cerrar todas las figuras abiertas
             
             # Liberar GeoDataFrames explícitamente
             del gdf_calles
@@ -599,7 +690,6 @@ def crear_mapa_emocional(descripcion: str) -> str:
                     pass
         except Exception as e:
             plt.close(fig)
-            plt.close('all')
             # Intentar liberar memoria en caso de error
             if 'gdf_calles' in locals():
                 del gdf_calles
@@ -623,3 +713,25 @@ def crear_mapa_emocional(descripcion: str) -> str:
 
     except Exception as e:
         return f"Error al generar la cartografía emocional: {e}"
+
+
+async def crear_mapa_emocional(descripcion: str) -> str:
+    """
+    Genera un mapa emocional del Bosque La Macarena (Bogotá) usando osmnx + geopandas + matplotlib.
+    A partir de una descripción textual, detecta una emoción o sensación asociada y aplica una 
+    paleta de colores contrastante para representar visualmente ese estado emocional.
+
+    Emociones o sensaciones principales:
+    
+    - serenidad: calma, paz, tranquilidad, silencio reconfortante, conexión armónica con el entorno
+    - curiosidad: exploración activa, preguntas, investigar, intriga, deseo de descubrir
+    - contemplacion: reflexión profunda, observación sin prisa, introspección, pensamiento pausado
+    - melancolia: nostalgia, tristeza reflexiva, melancolía, pérdida, belleza dolorosa, memoria
+    - vitalidad: energía, vida abundante, movimiento, biodiversidad visible, entusiasmo
+    - frescura: humedad, rocío, bruma, niebla, lluvia, tierra mojada, ambiente húmedo
+    - asombro: sorpresa intensa, "wow", descubrimiento impactante, maravilla, lo inesperado
+    - alegria: felicidad pura, celebración, gozo, contento, bienestar emocional
+    """
+    # Las descargas de OpenStreetMap, el render con matplotlib y la subida a Cloud
+    # Storage son bloqueantes: se ejecutan en un hilo para no detener el event loop.
+    return await asyncio.to_thread(_crear_mapa_emocional_bloqueante, descripcion)
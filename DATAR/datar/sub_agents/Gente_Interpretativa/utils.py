@@ -1,11 +1,14 @@
 """
 Utilidades para GenteInterpretativa.
 """
+import logging
 from pathlib import Path
 from google.adk.models.llm_response import LlmResponse
 from google.adk.agents.callback_context import CallbackContext
 from google.genai import types
 
+logger = logging.getLogger(__name__)
+
 def obtener_path_instrucciones():
     """
     Obtiene el path absoluto de la carpeta 'instrucciones'.
@@ -33,65 +36,67 @@ def leer_instrucciones(archivo: str = "ins_defecto.md"):
  
     return instrucciones
 
-def cambiar_respuesta_emojis(callback_context: CallbackContext, llm_response: LlmResponse):
-    """
-    Función para guardar respuesta del LLM en una variable de 
-    contexto y modificar la respuesta del agente al usuario para mostrar "Procesando...". 
-    
-    Este callback oculta la respuesta del agente paralelo de emojis, ya que solo
-    el agente final debe mostrar su respuesta al usuario. El streaming se aplica
-    solo al agente final (agente_re_interpretativa) que no tiene callback.
+TEXTO_PROCESANDO = 'Procesando...'
+
+def _respuesta_procesando() -> LlmResponse:
     """
-    # Verificar si hay contenido en la respuesta
-    if llm_response.content and llm_response.content.parts and len(llm_response.content.parts) > 0:
-        texto_respuesta = llm_response.content.parts[0].text
-        
-        # Asignar respuesta del modelo a una variable en estado
-        callback_context.state['respuesta_emojis'] = texto_respuesta
-        
-        # Debug: confirmar que se guardó
-        print(f"[DEBUG] respuesta_emojis guardada: {len(callback_context.state['respuesta_emojis'])} caracteres", flush=True)
+    Construye la respuesta "Procesando..." que muestran los agentes intermedios.
 
-        # Ocultar la respuesta mostrando "Procesando..." para mantener el flujo correcto
-        # El streaming se aplicará solo al agente final que no tiene callback
-        return LlmResponse(
-            content=types.Content(role="model", parts=[types.Part(text='Procesando...')])
-        )
-    else:
-        # Si no hay contenido, mostrar "Procesando..."
-        return LlmResponse(
-            content=types.Content(role="model", parts=[types.Part(text='Procesando...')])
-        )
+    Se genera una instancia nueva en cada llamada porque ADK puede modificar la
+    respuesta que devuelve el callback.
+    """
+    return LlmResponse(
+        content=types.Content(role="model", parts=[types.Part(text=TEXTO_PROCESANDO)])
+    )
 
-def cambiar_respuesta_textual(callback_context: CallbackContext, llm_response: LlmResponse):
+def crear_callback_guardar_respuesta(clave_estado: str):
     """
-    Función para guardar respuesta del LLM en una variable de 
-    contexto y modificar la respuesta del agente al usuario para mostrar "Procesando...". 
-    
-    Este callback oculta la respuesta del agente paralelo textual, ya que solo
-    el agente final debe mostrar su respuesta al usuario. El streaming se aplica
-    solo al agente final (agente_re_interpretativa) que no tiene callback.
+    Crea un after_model_callback que guarda la respuesta del LLM en
+    `callback_context.state[clave_estado]` y modifica la respuesta del agente
+    al usuario para mostrar "Procesando...".
+
+    Los agentes intermedios (emojis, textual y fusionador) comparten este mismo
+    comportamiento y solo difieren en la variable de estado donde guardan su
+    respuesta, por eso se generan desde esta función.
+
+    Args:
+        clave_estado (str): Nombre de la variable de estado donde se guarda la respuesta.
+
+    Returns:
+        Callable: Callback compatible con after_model_callback.
     """
-    # Verificar si hay contenido en la respuesta
-    if llm_response.content and llm_response.content.parts and len(llm_response.content.parts) > 0:
-        texto_respuesta = llm_response.content.parts[0].text
-        
-        # Asignar respuesta del modelo a una variable en estado
-        callback_context.state['respuesta_textual'] = texto_respuesta
-        
-        # Debug: confirmar que se guardó
-        print(f"[DEBUG] respuesta_textual guardada: {len(callback_context.state['respuesta_textual'])} caracteres", flush=True)
+    def callback(callback_context: CallbackContext, llm_response: LlmResponse):
+        """
+        Guarda la respuesta del LLM en el estado y la oculta mostrando "Procesando...".
+
+        Solo el agente final debe mostrar su respuesta al usuario. El streaming se aplica
+        solo al agente final (agente_re_interpretativa) que no tiene callback.
+        """
+        # Verificar si hay contenido en la respuesta
+        if llm_response.content and llm_response.content.parts and len(llm_response.content.parts) > 0:
+            texto_respuesta = llm_response.content.parts[0].text
+
+            # Asignar respuesta del modelo a una variable en estado
+            callback_context.state[clave_estado] = texto_respuesta
+
+            # Debug: confirmar que se guardó
+            logger.debug("%s guardada: %d caracteres", clave_estado, len(texto_respuesta))
 
         # Ocultar la respuesta mostrando "Procesando..." para mantener el flujo correcto
-        # El streaming se aplicará solo al agente final que no tiene callback
-        return LlmResponse(
-            content=types.Content(role="model", parts=[types.Part(text='Procesando...')])
-        )
-    else:
-        # Si no hay contenido, mostrar "Procesando..."
-        return LlmResponse(
-            content=types.Content(role="model", parts=[types.Part(text='Procesando...')])
-        )
+        # (también cuando no hay contenido). El streaming se aplicará solo al agente
+        # final que no tiene callback
+        return _respuesta_procesando()
+
+    return callback
+
+# Oculta la respuesta del agente paralelo de emojis
+cambiar_respuesta_emojis = crear_callback_guardar_respuesta('respuesta_emojis')
+
+# Oculta la respuesta del agente paralelo textual
+cambiar_respuesta_textual = crear_callback_guardar_respuesta('respuesta_textual')
+
+# Oculta la respuesta del fusionador
+cambiar_respuesta_fusionadora = crear_callback_guardar_respuesta('respuesta_fusionadora')
 
 def verificar_estado_fusionador(callback_context: CallbackContext, llm_request=None):
     """
@@ -103,55 +108,30 @@ def verificar_estado_fusionador(callback_context: CallbackContext, llm_request=N
         callback_context: Contexto del callback con el estado
         llm_request: Request del LLM (parámetro requerido por before_model_callback)
     """
-    print("[DEBUG] verificar_estado_fusionador llamado", flush=True)
+    logger.debug("verificar_estado_fusionador llamado")
     
     # Verificar que las variables del estado estén disponibles
-    if 'respuesta_emojis' not in callback_context.state:
-        callback_context.state['respuesta_emojis'] = ''
-        print("[DEBUG] respuesta_emojis no encontrada en estado, inicializada como vacía", flush=True)
+    respuesta_emojis = callback_context.state.get('respuesta_emojis')
+    if respuesta_emojis is None:
+        respuesta_emojis = callback_context.state['respuesta_emojis'] = ''
+        logger.debug("respuesta_emojis no encontrada en estado, inicializada como vacía")
     else:
-        print(f"[DEBUG] respuesta_emojis encontrada: {len(callback_context.state['respuesta_emojis'])} caracteres", flush=True)
+        logger.debug("respuesta_emojis encontrada: %d caracteres", len(respuesta_emojis))
         
-    if 'respuesta_textual' not in callback_context.state:
-        callback_context.state['respuesta_textual'] = ''
-        print("[DEBUG] respuesta_textual no encontrada en estado, inicializada como vacía", flush=True)
+    respuesta_textual = callback_context.state.get('respuesta_textual')
+    if respuesta_textual is None:
+        respuesta_textual = callback_context.state['respuesta_textual'] = ''
+        logger.debug("respuesta_textual no encontrada en estado, inicializada como vacía")
     else:
-        print(f"[DEBUG] respuesta_textual encontrada: {len(callback_context.state['respuesta_textual'])} caracteres", flush=True)
+        logger.debug("respuesta_textual encontrada: %d caracteres", len(respuesta_textual))
     
     # Debug: mostrar qué hay en el estado
-    print(f"[DEBUG] Estado fusionador completo - respuesta_emojis: {bool(callback_context.state.get('respuesta_emojis'))}, respuesta_textual: {bool(callback_context.state.get('respuesta_textual'))}", flush=True)
+    logger.debug(
+        "Estado fusionador completo - respuesta_emojis: %s, respuesta_textual: %s",
+        bool(respuesta_emojis), bool(respuesta_textual),
+    )
     
     # Mostrar "Procesando..." mientras el fusionador se prepara
     # Nota: before_model_callback no puede retornar LlmResponse, solo puede modificar el estado
     # El mensaje "Procesando..." se mostrará cuando el agente comience a procesar
     return None
-
-def cambiar_respuesta_fusionadora(callback_context: CallbackContext, llm_response: LlmResponse):
-    """
-    Función para guardar respuesta del LLM en una variable de 
-    contexto y modificar la respuesta del agente al usuario para mostrar "Procesando...". 
-    
-    Este callback oculta la respuesta del fusionador, ya que solo
-    el agente final debe mostrar su respuesta al usuario. El streaming se aplica
-    solo al agente final (agente_re_interpretativa) que no tiene callback.
-    """
-    # Verificar si hay contenido en la respuesta
-    if llm_response.content and llm_response.content.parts and len(llm_response.content.parts) > 0:
-        texto_respuesta = llm_response.content.parts[0].text
-        
-        # Asignar respuesta del modelo a una variable en estado
-        callback_context.state['respuesta_fusionadora'] = texto_respuesta
-        
-        # Debug: confirmar que se guardó
-        print(f"[DEBUG] respuesta_fusionadora guardada: {len(callback_context.state['respuesta_fusionadora'])} caracteres", flush=True)
-
-        # Ocultar la respuesta mostrando "Procesando..." para mantener el flujo correcto
-        # El streaming se aplicará solo al agente final que no tiene callback
-        return LlmResponse(
-            content=types.Content(role="model", parts=[types.Part(text='Procesando...')])
-        )
-    else:
-        # Si no hay contenido, mostrar "Procesando..."
-        return LlmResponse(
-            content=types.Content(role="model", parts=[types.Part(text='Procesando...')])
-        )
\ No newline at end of file
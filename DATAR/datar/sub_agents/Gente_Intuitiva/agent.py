@@ -1,3 +1,4 @@
+import asyncio
 import os
 import re
 from pathlib import Path
@@ -129,16 +130,23 @@ async def crear_imagen_rio_emocional() -> str:
     if not _ultima_interpretacion:
         return "⚠️ Aún no tengo una interpretación de tu río emocional. Envíame algunos emojis primero para que pueda interpretarlos."
 
-    try:
-        # Generar y guardar la imagen usando la interpretación
-        ruta_imagen = guardar_imagen_texto(_ultima_interpretacion)
+    # Tomar la interpretación y limpiarla antes de ceder el event loop: mientras se
+    # dibuja, otra sesión puede guardar una interpretación nueva que no debe perderse
+    texto = _ultima_interpretacion
+    _ultima_interpretacion = ""
 
-        # Limpiar la interpretación después de usarla
-        _ultima_interpretacion = ""
+    try:
+        # Generar y guardar la imagen usando la interpretación.
+        # El dibujo con Pillow y la subida a Cloud Storage son bloqueantes, así que
+        # se ejecutan en un hilo para no detener el event loop del servidor ADK.
+        ruta_imagen = await asyncio.to_thread(guardar_imagen_texto, texto)
 
         return f"✨ He creado tu visualización de tú río emocional.\n\n📍 Imagen guardada en: {ruta_imagen}\n\nLa imagen traduce tu río emocional en un trazo visual dinámico usando matemáticas y arte."
 
     except Exception as e:
+        # Restaurarla para poder reintentar, salvo que ya haya llegado otra más reciente
+        if not _ultima_interpretacion:
+            _ultima_interpretacion = texto
         return f"⚠️ Hubo un problema al crear la visualización: {str(e)}"
 
 
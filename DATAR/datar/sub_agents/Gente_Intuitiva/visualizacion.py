@@ -2,7 +2,9 @@
 Herramienta para generar visualizaciones del río emocional
 """
 import io
+import logging
 import os
+import uuid
 from datetime import datetime
 from pathlib import Path as FilePath
 from PIL import Image, ImageDraw, ImageFont
@@ -12,6 +14,8 @@ from matplotlib.path import Path
 import numpy as np
 import google.genai.types as types
 
+logger = logging.getLogger(__name__)
+
 
 # Mapeo de emojis a colores emocionales
 EMOJI_COLORES = {
@@ -332,7 +336,7 @@ def generar_puntos_numpy(parametros: dict, img_width: int, img_height: int) -> l
     return all_main_trace_points
 
 
-def generar_imagen_texto(texto: str) -> Image.Image:
+def generar_imagen_texto(texto: str, ahora: datetime | None = None) -> Image.Image:
     """
     Genera una imagen interpretativa del texto usando Pillow,
     con el trazo dividido en fases narrativas y grosor dinámico,
@@ -340,6 +344,8 @@ def generar_imagen_texto(texto: str) -> Image.Image:
 
     Args:
         texto: El texto a visualizar
+        ahora: Momento de creación que se imprime en la imagen. Si no se da, se usa
+            la hora actual.
 
     Returns:
         Image: Imagen PIL generada
@@ -381,14 +387,14 @@ def generar_imagen_texto(texto: str) -> Image.Image:
 
     # --- Selección de Estilo de Trazo y Dibujo ---
     if not main_trace_points or len(main_trace_points) < 2:
-        print("No hay suficientes puntos para dibujar el trazo.")
+        logger.debug("No hay suficientes puntos para dibujar el trazo.")
         draw.text((width // 2, height // 2), "No se pudo generar el trazo", fill="#FF0000", anchor='mm', font=font)
         return imagen
 
     # Lógica de selección de estilo de trazo
     if norm_intensidad > 0.8 and norm_calma < 0.2:
         # Estilo "Disperso" / "Nube de Puntos": Para caos, confusión
-        print("Estilo de trazo: Disperso")
+        logger.debug("Estilo de trazo: Disperso")
         # Dibuja puntos pequeños alrededor de la trayectoria
         for x, y in main_trace_points:
             num_dots = np.random.randint(5, 15) # Más puntos si es más intenso
@@ -400,7 +406,7 @@ def generar_imagen_texto(texto: str) -> Image.Image:
 
     elif norm_calma > 0.7 and norm_intensidad < 0.3:
         # Estilo "Solitario" / "Fino": Para reflexión, sutileza
-        print("Estilo de trazo: Solitario")
+        logger.debug("Estilo de trazo: Solitario")
         # Una sola línea muy fina, quizás con opacidad variable
         base_width = 1
         color = (0, 0, 0, int(255 * (0.3 + norm_calma * 0.7))) # Más opaco con calma
@@ -415,7 +421,7 @@ def generar_imagen_texto(texto: str) -> Image.Image:
         
     elif norm_intensidad > 0.5 and norm_calma > 0.4:
         # Estilo "Sólido" / "Marcado": Determinación, firmeza
-        print("Estilo de trazo: Sólido")
+        logger.debug("Estilo de trazo: Sólido")
         # Un trazo más grueso y continuo
         dynamic_width = int(5 + norm_intensidad * 8 - norm_calma * 2) # Más grueso con intensidad
         dynamic_width = max(2, dynamic_width) # Grosor mínimo
@@ -430,7 +436,7 @@ def generar_imagen_texto(texto: str) -> Image.Image:
 
     elif norm_intensidad > 0.3 and norm_calma < 0.5 and parametros['signos_pregunta'] > 0: # Añadir signo de pregunta como factor
         # Estilo "Fragmentado" / "Interrumpido": Indecisión, interrupción
-        print("Estilo de trazo: Fragmentado")
+        logger.debug("Estilo de trazo: Fragmentado")
         segment_length_base = 15 + norm_intensidad * 10
         gap_length_base = 5 + (1 - norm_calma) * 10
 
@@ -447,7 +453,7 @@ def generar_imagen_texto(texto: str) -> Image.Image:
             
     else:
         # Estilo "Básico Orgánico" (similar al original, pero una sola línea fluida)
-        print("Estilo de trazo: Básico Orgánico")
+        logger.debug("Estilo de trazo: Básico Orgánico")
         base_width = 2
         # El grosor del trazo principal varía con la intensidad
         dynamic_width_factor = 1 + norm_intensidad * 3 - norm_calma * 1.5
@@ -464,7 +470,7 @@ def generar_imagen_texto(texto: str) -> Image.Image:
 
 
     # Fecha y hora de creación en la parte inferior
-    fecha_hora = datetime.now().strftime("%d/%m/%Y - %H:%M:%S")
+    fecha_hora = (ahora or datetime.now()).strftime("%d/%m/%Y - %H:%M:%S")
     draw.text((width // 2, height - 20), fecha_hora, fill='#555', anchor='mm', font=font_small)
 
     return imagen
@@ -485,12 +491,15 @@ def guardar_imagen_texto(texto: str) -> str:
     Returns:
         str: Ruta donde se guardó la imagen
     """
+    # Una sola lectura del reloj para la fecha impresa y el nombre del archivo
+    ahora = datetime.now()
+
     # Generar la imagen
-    imagen = generar_imagen_texto(texto)
+    imagen = generar_imagen_texto(texto, ahora)
 
     # Crear nombre de archivo único
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    nombre_archivo = f"trazo_{timestamp}.png"
+    timestamp = ahora.strftime("%Y%m%d_%H%M%S")
+    nombre_archivo = f"trazo_{timestamp}_{uuid.uuid4().hex}.png"
 
     # Usar archivo temporal que se eliminará después de subir
     import tempfile
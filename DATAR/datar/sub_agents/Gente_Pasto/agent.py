@@ -1,4 +1,7 @@
+import asyncio
+import logging
 import os
+import uuid
 from datetime import datetime
 from random import randint, choice
 import numpy as np
@@ -10,6 +13,7 @@ from ...agents_utils import get_openrouter_config
 
 
 config = get_openrouter_config()
+logger = logging.getLogger(__name__)
 
 # --- Configuración de carpetas --- #
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -223,7 +227,7 @@ def exportar_wav(audio_data: np.ndarray, sample_rate: int, ruta_archivo: str):
     # Guardar WAV
     wavfile.write(ruta_archivo, sample_rate, audio_int16)
 
-def generar_paisaje_sonoro(
+def _generar_paisaje_sonoro_bloqueante(
     pajaros_vol: int = 0,
     insectos_vol: int = 0,
     viento_vol: int = 0,
@@ -232,25 +236,7 @@ def generar_paisaje_sonoro(
     efectos: bool = True
 ) -> str:
     """
-    Genera un paisaje sonoro artístico mezclando los audios locales.
-
-    Parámetros:
-    - pajaros_vol: volumen de los pájaros (dB)
-    - insectos_vol: volumen de los insectos (dB)
-    - viento_vol: volumen del viento (dB)
-    - tinguas_vol: volumen de tinguas (dB)
-    - duracion_seg: duración total del mix en segundos (máximo 10 segundos)
-    - efectos: si aplica efectos artísticos aleatorios
-
-    Retorna:
-    - Ruta del archivo WAV generado.
-    
-    El agente puede:
-    - Combinar sonidos con distintos volúmenes.
-    - Aplicar efectos creativos como eco, reversa y cambios de velocidad.
-    - Decidir no usar ciertos sonidos, o usar todos.
-    El agente debe:
-    - Usar la herramienta para crear sonidos muy diferentes cada vez. 
+    Mezcla las capas de audio, exporta el WAV y lo sube a Cloud Storage (bloqueante).
     """
     # Limitar la duración máxima a 10 segundos
     duracion_seg = min(duracion_seg, 10)
@@ -300,8 +286,7 @@ def generar_paisaje_sonoro(
     
     # Si hay errores, informarlos pero continuar si hay al menos una capa válida
     if errores:
-        mensaje_error = f"Advertencia: No se pudieron cargar algunos sonidos: {', '.join(errores)}"
-        print(mensaje_error)
+        logger.warning("No se pudieron cargar algunos sonidos: %s", ", ".join(errores))
 
     if not capas:
         raise ValueError(
@@ -318,7 +303,7 @@ def generar_paisaje_sonoro(
 
     # Generar nombre de archivo y subir directamente a Cloud Storage
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    nombre_archivo = f"paisaje_sonoro_{timestamp}.wav"
+    nombre_archivo = f"paisaje_sonoro_{timestamp}_{uuid.uuid4().hex}.wav"
     
     # Usar archivo temporal que se eliminará después de subir
     import tempfile
@@ -366,6 +351,47 @@ def generar_paisaje_sonoro(
 
     return mensaje
 
+async def generar_paisaje_sonoro(
+    pajaros_vol: int = 0,
+    insectos_vol: int = 0,
+    viento_vol: int = 0,
+    tinguas_vol: int = 0,
+    duracion_seg: int = 10,
+    efectos: bool = True
+) -> str:
+    """
+    Genera un paisaje sonoro artístico mezclando los audios locales.
+
+    Parámetros:
+    - pajaros_vol: volumen de los pájaros (dB)
+    - insectos_vol: volumen de los insectos (dB)
+    - viento_vol: volumen del viento (dB)
+    - tinguas_vol: volumen de tinguas (dB)
+    - duracion_seg: duración total del mix en segundos (máximo 10 segundos)
+    - efectos: si aplica efectos artísticos aleatorios
+
+    Retorna:
+    - Ruta del archivo WAV generado.
+    
+    El agente puede:
+    - Combinar sonidos con distintos volúmenes.
+    - Aplicar efectos creativos como eco, reversa y cambios de velocidad.
+    - Decidir no usar ciertos sonidos, o usar todos.
+    El agente debe:
+    - Usar la herramienta para crear sonidos muy diferentes cada vez. 
+    """
+    # La mezcla con numpy, la escritura del WAV y la subida a Cloud Storage son
+    # bloqueantes: se ejecutan en un hilo para no detener el event loop del servidor ADK.
+    return await asyncio.to_thread(
+        _generar_paisaje_sonoro_bloqueante,
+        pajaros_vol,
+        insectos_vol,
+        viento_vol,
+        tinguas_vol,
+        duracion_seg,
+        efectos,
+    )
+
 # ------- AGENTE --------
 root_agent = Agent(
     model=LiteLlm(
@@ -2,6 +2,7 @@ import numpy as np
 import sounddevice as sd
 from scipy.io import wavfile
 import os
+import uuid
 from datetime import datetime
 
 # Parámetros de audio
@@ -111,7 +112,7 @@ def exportar_audio(audio_data, samplerate):
     
     # Generar nombre de archivo con timestamp
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    nombre_base = f"humedal_conejera_{timestamp}"
+    nombre_base = f"humedal_conejera_{timestamp}_{uuid.uuid4().hex}"
     
     # Convertir audio a int16 para guardarlo
     audio_int16 = np.int16(audio_data * 32767)
@@ -1,10 +1,16 @@
 # tools.py - Herramientas para el Agente de Sonidos
 
+import asyncio
+import logging
 import numpy as np
 import os
+import uuid
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Dict, List
 
+logger = logging.getLogger(__name__)
+
 # Importar matplotlib solo si está disponible
 try:
     import matplotlib
@@ -23,8 +29,7 @@ except ImportError:
 
 def log_uso(funcion, tipo):
     """Guarda registro de cada función usada."""
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    print(f"[{timestamp}] Usando {tipo}: {funcion}", flush=True)
+    logger.info("Usando %s: %s", tipo, funcion)
 
 def _generar_ascii_grafico(descripcion: str) -> str:
     """Genera representación ASCII de un gráfico (fallback sin matplotlib)."""
@@ -82,15 +87,9 @@ def _generar_ascii_grafico(descripcion: str) -> str:
   🦋  🐝  🦗  🐛  🕷️  🦌
 """
 
-def generar_grafico_turtle(descripcion: str) -> str:
+def _generar_grafico_turtle_bloqueante(descripcion: str) -> str:
     """
-    Genera un gráfico basado en la descripción y lo guarda como archivo (si matplotlib disponible).
-    
-    Args:
-        descripcion: Descripción del gráfico a generar (p.ej., "bosque", "agua", "humedal")
-    
-    Returns:
-        Confirmación del gráfico generado y ruta del archivo
+    Dibuja el gráfico con matplotlib y lo sube a Cloud Storage (bloqueante).
     """
     log_uso(descripcion, "gráfico")
     
@@ -160,7 +159,7 @@ def generar_grafico_turtle(descripcion: str) -> str:
         
         # Generar nombre de archivo y usar archivo temporal
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"grafico_{descripcion.replace(' ', '_')[:20]}_{timestamp}.png"
+        filename = f"grafico_{descripcion.replace(' ', '_')[:20]}_{timestamp}_{uuid.uuid4().hex}.png"
         
         import tempfile
         url_gcs = None
@@ -170,7 +169,7 @@ def generar_grafico_turtle(descripcion: str) -> str:
             # Crear archivo temporal
             with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as temp_file:
                 ruta_temp = temp_file.name
-                plt.savefig(ruta_temp, dpi=100, bbox_inches='tight')
+                fig.savefig(ruta_temp, dpi=100, bbox_inches='tight')
             
             plt.close(fig)
             
@@ -213,78 +212,92 @@ def generar_grafico_turtle(descripcion: str) -> str:
         ascii_grafico = _generar_ascii_grafico(descripcion)
         return f"⚠️ Usando representación ASCII (matplotlib no disponible):\n{ascii_grafico}"
 
-def generar_ascii_morse(sonido: str) -> str:
+async def generar_grafico_turtle(descripcion: str) -> str:
     """
-    Genera representación ASCII y código morse para representar sonidos.
+    Genera un gráfico basado en la descripción y lo guarda como archivo (si matplotlib disponible).
     
     Args:
-        sonido: Tipo de sonido (p.ej., "viento", "agua", "pajaro")
+        descripcion: Descripción del gráfico a generar (p.ej., "bosque", "agua", "humedal")
     
     Returns:
-        Representación ASCII y morse del sonido
+        Confirmación del gráfico generado y ruta del archivo
     """
-    log_uso(sonido, "ASCII/Morse")
-    
-    # Mapeo de sonidos a patrones ASCII
-    patrones_ascii = {
-        "viento": """
+    # El dibujo con matplotlib y la subida a Cloud Storage son bloqueantes:
+    # se ejecutan en un hilo para no detener el event loop del servidor ADK.
+    return await asyncio.to_thread(_generar_grafico_turtle_bloqueante, descripcion)
+
+@dataclass(frozen=True, slots=True)
+class RepresentacionSonora:
+    """Patrón ASCII y código morse asociados a un sonido."""
+    ascii: str
+    morse: str
+
+# Representación ASCII y código morse (simplificado) de cada sonido, en una sola
+# tabla para resolver ambas con una única búsqueda.
+REPRESENTACIONES_SONORAS = {
+    "viento": RepresentacionSonora(
+        ascii="""
         ∿∿∿∿∿∿∿∿∿∿∿∿∿∿
         ≈≈≈≈≈≈≈≈≈≈≈≈≈≈
         ∿∿∿∿∿∿∿∿∿∿∿∿∿∿
         """,
-        "agua": """
+        morse="...- .. . -. - .",
+    ),
+    "agua": RepresentacionSonora(
+        ascii="""
         ≋≋≋≋≋≋≋≋≋≋≋≋
         ∽∽∽∽∽∽∽∽∽∽∽∽
         ≋≋≋≋≋≋≋≋≋≋≋≋
         """,
-        "pajaro": """
+        morse=".- --. ..- .-",
+    ),
+    "pajaro": RepresentacionSonora(
+        ascii="""
         ◯◯◯◯  ~~ ^^
         ◯◯◯◯ ~  ~~
         ◯◯◯◯  ~~~
         """,
-        "insecto": """
+        morse=".--. .- .--- .- .-.",
+    ),
+    "insecto": RepresentacionSonora(
+        ascii="""
         ⚬⚬⚬⚬  ∴∴
         ⚬⚬⚬⚬ ∴ ∴
         ⚬⚬⚬⚬  ∴∴
         """,
-    }
+        morse="..- -. --- ..",
+    ),
+}
+
+def generar_ascii_morse(sonido: str) -> str:
+    """
+    Genera representación ASCII y código morse para representar sonidos.
     
-    # Mapeo a código morse (simplificado)
-    morse_map = {
-        "viento": "...- .. . -. - .",
-        "agua": ".- --. ..- .-",
-        "pajaro": ".--. .- .--- .- .-.",
-        "insecto": "..- -. --- ..",
-    }
+    Args:
+        sonido: Tipo de sonido (p.ej., "viento", "agua", "pajaro")
+    
+    Returns:
+        Representación ASCII y morse del sonido
+    """
+    log_uso(sonido, "ASCII/Morse")
     
     sonido_lower = sonido.lower().strip()
     
     salida = f"🎵 Representación de sonido: {sonido}\n\n"
     
-    if sonido_lower in patrones_ascii:
-        salida += "ASCII:\n" + patrones_ascii[sonido_lower] + "\n"
+    representacion = REPRESENTACIONES_SONORAS.get(sonido_lower)
+    if representacion is not None:
+        salida += "ASCII:\n" + representacion.ascii + "\n"
+        salida += f"\nCódigo Morse:\n{representacion.morse}\n"
     else:
         salida += f"ASCII: [Patrón para '{sonido}' no disponible]\n"
-    
-    if sonido_lower in morse_map:
-        salida += f"\nCódigo Morse:\n{morse_map[sonido_lower]}\n"
-    else:
         salida += f"\nCódigo Morse: [Morse para '{sonido}' no disponible]\n"
     
     return salida
 
-def generar_composicion_sonido(especificaciones: str) -> str:
+def _generar_composicion_sonido_bloqueante(especificaciones: str) -> str:
     """
-    Genera una composición de sonido con numpy basada en especificaciones y la guarda como archivo WAV.
-    Crea composiciones ricas con múltiples capas de sonido (fondo ambiental, aves, variaciones).
-    Usa scipy para exportar directamente a WAV sin necesidad de ffmpeg.
-    
-    Args:
-        especificaciones: Especificaciones del sonido (p.ej., "frecuencia: 440, duración: 2, tipo: humedal")
-                        Tipos soportados: "humedal", "bosque", "agua", "viento", o "simple" para tono básico
-    
-    Returns:
-        Información sobre la composición de sonido generada y ruta del archivo guardado
+    Sintetiza la composición, escribe el WAV y lo sube a Cloud Storage (bloqueante).
     """
     log_uso(especificaciones, "composición de sonido")
     
@@ -433,7 +446,7 @@ def generar_composicion_sonido(especificaciones: str) -> str:
         
         # Generar nombre de archivo con timestamp
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        nombre_base = f"composicion_sonido_{timestamp}"
+        nombre_base = f"composicion_sonido_{timestamp}_{uuid.uuid4().hex}"
         nombre_archivo = f"{nombre_base}.wav"
         
         # Usar archivo temporal que se eliminará después de subir
@@ -514,6 +527,64 @@ def generar_composicion_sonido(especificaciones: str) -> str:
     except Exception as e:
         return f"❌ Error al generar composición: {str(e)}"
 
+async def generar_composicion_sonido(especificaciones: str) -> str:
+    """
+    Genera una composición de sonido con numpy basada en especificaciones y la guarda como archivo WAV.
+    Crea composiciones ricas con múltiples capas de sonido (fondo ambiental, aves, variaciones).
+    Usa scipy para exportar directamente a WAV sin necesidad de ffmpeg.
+    
+    Args:
+        especificaciones: Especificaciones del sonido (p.ej., "frecuencia: 440, duración: 2, tipo: humedal")
+                        Tipos soportados: "humedal", "bosque", "agua", "viento", o "simple" para tono básico
+    
+    Returns:
+        Información sobre la composición de sonido generada y ruta del archivo guardado
+    """
+    # La síntesis con numpy, la escritura del WAV y la subida a Cloud Storage son
+    # bloqueantes: se ejecutan en un hilo para no detener el event loop del servidor ADK.
+    return await asyncio.to_thread(_generar_composicion_sonido_bloqueante, especificaciones)
+
+# Especies sonoras de Bogotá y alrededores
+ESPECIES_POR_LUGAR = {
+    "humedal conejera": [
+        "🦆 Tinguas (Aramides): Sonidos guturales, croadores",
+        "🐦 Chirlobirlos (Tachycineta albiventer): Trinos agudos",
+        "🦢 Garzas: Graznidos profundos",
+        "🐸 Ranas: Croidos estridentes",
+        "🪳 Insectos acuáticos: Zumbidos y chasquidos",
+        "💨 Viento en juncos: Susurros rítmicos"
+    ],
+    "bogotá": [
+        "🦅 Águilas: Silbidos penetrantes",
+        "🦜 Loros: Chillidos variados",
+        "🌳 Pájaros bosque nublado: Trinos complejos",
+        "🐸 Anfibios: Croidos característicos",
+        "🪲 Insectos: Zumbidos y chirridos",
+        "💨 Viento páramo: Sonidos silbantes"
+    ],
+    "bosque": [
+        "🦅 Rapaces: Silbidos agudos",
+        "🐦 Pájaros cantores: Melodías complejas",
+        "🦎 Insectos: Chirridos y zumbidos",
+        "🦇 Murciélagos: Ecolocalización (ultrasónica)",
+        "🌿 Hojas al viento: Susurros suave",
+        "💧 Agua corriente: Murmullos constantes"
+    ]
+}
+
+# Listados ya formateados (una especie por línea) para cada lugar y para el caso
+# genérico; la respuesta de la herramienta solo añade la cabecera con la ubicación.
+_LISTADO_ESPECIES_POR_LUGAR = {
+    lugar: "".join(f"{especie}\n" for especie in especies)
+    for lugar, especies in ESPECIES_POR_LUGAR.items()
+}
+_LISTADO_ESPECIES_GENERALES = "Especies sonoras generales:\n" + "".join(
+    f"{especie}\n"
+    for especies in ESPECIES_POR_LUGAR.values()
+    for especie in especies[:3]
+)
+_SEPARADOR_ESPECIES = "━" * 50 + "\n\n"
+
 def explorar_especies_sonoras(ubicacion: str) -> str:
     """
     Explora especies sonoras comunes en una ubicación específica.
@@ -526,53 +597,12 @@ def explorar_especies_sonoras(ubicacion: str) -> str:
     """
     log_uso(ubicacion, "exploración de especies sonoras")
     
-    # Especies sonoras de Bogotá y alrededores
-    especies_por_lugar = {
-        "humedal conejera": [
-            "🦆 Tinguas (Aramides): Sonidos guturales, croadores",
-            "🐦 Chirlobirlos (Tachycineta albiventer): Trinos agudos",
-            "🦢 Garzas: Graznidos profundos",
-            "🐸 Ranas: Croidos estridentes",
-            "🪳 Insectos acuáticos: Zumbidos y chasquidos",
-            "💨 Viento en juncos: Susurros rítmicos"
-        ],
-        "bogotá": [
-            "🦅 Águilas: Silbidos penetrantes",
-            "🦜 Loros: Chillidos variados",
-            "🌳 Pájaros bosque nublado: Trinos complejos",
-            "🐸 Anfibios: Croidos característicos",
-            "🪲 Insectos: Zumbidos y chirridos",
-            "💨 Viento páramo: Sonidos silbantes"
-        ],
-        "bosque": [
-            "🦅 Rapaces: Silbidos agudos",
-            "🐦 Pájaros cantores: Melodías complejas",
-            "🦎 Insectos: Chirridos y zumbidos",
-            "🦇 Murciélagos: Ecolocalización (ultrasónica)",
-            "🌿 Hojas al viento: Susurros suave",
-            "💧 Agua corriente: Murmullos constantes"
-        ]
-    }
-    
     ubicacion_lower = ubicacion.lower().strip()
     
-    salida = f"🎵 Especies sonoras de: {ubicacion}\n"
-    salida += "━" * 50 + "\n\n"
-    
-    encontrado = False
-    for lugar, especies in especies_por_lugar.items():
-        if lugar in ubicacion_lower:
-            for especie in especies:
-                salida += f"{especie}\n"
-            encontrado = True
-            break
-    
-    if not encontrado:
+    listado = next(
+        (texto for lugar, texto in _LISTADO_ESPECIES_POR_LUGAR.items() if lugar in ubicacion_lower),
         # Retornar especies genéricas si no se encuentra la ubicación
-        salida += "Especies sonoras generales:\n"
-        for especies_lista in especies_por_lugar.values():
-            for especie in especies_lista[:3]:
-                salida += f"{especie}\n"
+        _LISTADO_ESPECIES_GENERALES,
+    )
     
-    return salida
-
+    return f"🎵 Especies sonoras de: {ubicacion}\n{_SEPARADOR_ESPECIES}{listado}"